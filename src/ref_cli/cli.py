@@ -5,9 +5,9 @@ Author: draeician (July 22, 2023)
 Purpose: To allow for fast CLI recording from the command line for later reference
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urlunparse, parse_qs, quote
+import lxml.html
+from lxml.etree import ParserError
+from urllib.parse import urlparse, urlsplit, urlunparse, parse_qs, quote
 import os
 import re
 import sys
@@ -15,27 +15,37 @@ import argparse
 import warnings
 import logging
 import yaml
-from datetime import datetime
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+from pathlib import Path
 from dotenv import load_dotenv, set_key
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import subprocess
 import time
-import select
-from urllib3.exceptions import InsecureRequestWarning
+import mmap
+import tempfile
+import shutil
+import sqlite3
 import importlib.resources
+import functools
+import itertools
+import bisect
+import contextlib
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from ref_cli import __version__
 
 # Configuration and setup
+@functools.lru_cache(maxsize=1)
 def get_default_config():
     """Load the default configuration from the package."""
     try:
         with importlib.resources.files('ref_cli').joinpath('config/default_config.yaml').open('r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
     except Exception as e:
-        logging.error(f"Error loading default config: {e}")
+        logging.error("Error loading default config: %s", e)
         return {
             'paths': {
                 'references': '~/references',
@@ -47,36 +57,56 @@ def get_default_config():
             ]
         }
 
+# The user's home directory, resolved once for every path derived from it
+HOME_DIR = os.path.expanduser("~")
+
 # Define the directory where you want the logs to be stored
-log_directory = os.path.expanduser("~/references/logs")
-os.makedirs(log_directory, exist_ok=True)
+log_directory = os.path.join(HOME_DIR, "references", "logs")
 
 # Define the log file paths
 log_file_path = os.path.join(log_directory, "ref.log")
 error_log_file_path = os.path.join(log_directory, "ref_errors.log")
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s %(levelname)s:%(message)s',
-    handlers=[
-        logging.FileHandler(log_file_path),
-        logging.StreamHandler()
-    ]
-)
-
-# Create a separate logger for errors
+# Separate logger for errors; its records also propagate to the root handlers.
+# Handlers are attached by configure_logging().
 error_logger = logging.getLogger('error_logger')
 error_logger.setLevel(logging.ERROR)
-error_file_handler = logging.FileHandler(error_log_file_path)
-error_file_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s:%(message)s'))
-error_logger.addHandler(error_file_handler)
+
+def configure_logging(debug_level: int = None) -> None:
+    """
+    Attaches the log file and console handlers and sets the log level. Called from main()
+    once arguments are parsed, so --help and --version never create or open log files.
+    Handlers are only attached once, even if this is called repeatedly.
+
+    Args:
+        debug_level (int): 1 for INFO, 2 for WARNING, 3 for DEBUG; anything else logs errors only.
+    """
+    root_logger = logging.getLogger()
+    if not root_logger.handlers:
+        os.makedirs(log_directory, exist_ok=True)
+        formatter = logging.Formatter('%(asctime)s %(levelname)s:%(message)s')
+        for handler in (logging.FileHandler(log_file_path), logging.StreamHandler()):
+            handler.setFormatter(formatter)
+            root_logger.addHandler(handler)
+        error_file_handler = logging.FileHandler(error_log_file_path)
+        error_file_handler.setFormatter(formatter)
+        error_logger.addHandler(error_file_handler)
+
+    # Set logging level based on the debug argument
+    if debug_level == 1:
+        root_logger.setLevel(logging.INFO)
+    elif debug_level == 2:
+        root_logger.setLevel(logging.WARNING)
+    elif debug_level == 3:
+        root_logger.setLevel(logging.DEBUG)
+    else:
+        root_logger.setLevel(logging.ERROR)
 
 # Filter out warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="urllib3")
 
 # Set environment path and load configuration
-env_path = os.path.join(os.path.expanduser("~"), '.env')
+env_path = os.path.join(HOME_DIR, '.env')
 load_dotenv(dotenv_path=env_path)
 
 # YouTube API details
@@ -84,51 +114,191 @@ YOUTUBE_API_SERVICE_NAME = 'youtube'
 YOUTUBE_API_VERSION = 'v3'
 DEVELOPER_KEY = os.getenv('YOUTUBE_API_KEY')
 
-# Load configuration
-CONFIG_DIR = os.path.join(os.path.expanduser("~"), '.config', 'ref')
-CONFIG_FILE = os.path.join(CONFIG_DIR, 'config.yaml')
+# Retries for YouTube API calls; googleapiclient backs off exponentially on 429, 5xx and rate-limit 403s
+API_RETRIES = 3
 
+# Partial-response field masks for playlist requests
+PLAYLIST_FIELDS = 'items/snippet(title,channelTitle)'
+PLAYLIST_ITEM_FIELDS = 'nextPageToken,items/snippet(title,channelTitle,resourceId/videoId)'
+
+# Load configuration
 config = get_default_config()
 BASE = os.path.expanduser(config['paths']['references'])
 UNIFIED = os.path.join(BASE, "references.md")
 TRANSCRIPTS_DIR = os.path.expanduser(config['paths']['transcripts'])
-
-# Copy all functions from original file
-def ensure_config_exists():
-    """Ensures that the configuration directory and file exist."""
-    if not os.path.exists(CONFIG_DIR):
-        os.makedirs(CONFIG_DIR)
-    if not os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'w') as file:
-            yaml.dump(get_default_config(), file)
-
-def load_config() -> dict:
-    """Loads the configuration from the YAML file."""
-    ensure_config_exists()
-    with open(CONFIG_FILE, 'r') as file:
-        config = yaml.safe_load(file)
-    return config
+REMOVABLE_KEYS = frozenset(config['removable_keys'])
+
+# Resolved redirects are kept across runs for REDIRECT_CACHE_TTL seconds
+REDIRECT_CACHE_FILE = os.path.join(HOME_DIR, '.cache', 'ref', 'redirects.sqlite')
+REDIRECT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Precompiled patterns used on per-line and per-URL paths
+INTEGRITY_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\|\[.*\]\(.*\)\|\(.*\)\|.*\|(YouTube|General)\n$')
+INTEGRITY_PATTERN_BYTES = re.compile(INTEGRITY_PATTERN.pattern.encode())
+REFERENCE_URL_PATTERN = re.compile(r'\[([^\]]+)\]')
+YOUTUBE_REDIRECT_PATTERN = re.compile(r'https://www\.youtube\.com/redirect\?')
+VIDEO_ID_QUERY_PATTERN = re.compile(r'v=([^&]+)')
+NON_ALNUM_PATTERN = re.compile('[^0-9a-zA-Z]+')
+SHORTS_PATH_PATTERN = re.compile(r'/shorts/([^/?]+)')
+LIVE_PATH_PATTERN = re.compile(r'/live/([^/?]+)')
+ARXIV_PDF_PATTERN = re.compile(r'(?:https?://)?arxiv\.org/pdf/(\d+\.\d+)')
+
+# Everything after the timestamp in the example line shown for malformed entries
+EXPECTED_LINE_SUFFIX = '|[URL]|(Title)|Source|(YouTube|General)'
+
+# Serializes writes to references.md when URLs are processed concurrently
+UNIFIED_LOCK = threading.RLock()
+
+# Serializes use of the shared redirect cache connection across threads
+REDIRECT_CACHE_LOCK = threading.Lock()
+
+# Redirects resolved successfully in this process; failures are left out so they are retried
+RESOLVED_REDIRECTS = {}
+RESOLVED_REDIRECTS_LOCK = threading.Lock()
+
+# Default number of URLs processed in parallel by read_urls_from_file (--jobs)
+FILE_WORKERS = 8
+# Lines of a --file input read ahead of the first unfinished one; queued lines only cost a tuple each
+FILE_WINDOW = 1024
+
+# Caps concurrent lynx and yt fetches across all workers, whatever --jobs is
+FETCH_SLOTS = threading.BoundedSemaphore(4)
+
+# Attempts per lynx or yt fetch; the wait between attempts starts at FETCH_BACKOFF seconds and doubles
+FETCH_ATTEMPTS = 3
+FETCH_BACKOFF = 1.0
+
+# Timestamp format of the first field of every references.md entry
+ENTRY_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+# Headers that mimic a browser when resolving redirects
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive',
+}
+
+# lynx options used to fetch page source for title extraction; the URL is appended per call
+LYNX_OPTIONS = (
+    '-dump', '-nolist', '-force_html', '-hiddenlinks=ignore',
+    '-display_charset=UTF-8', '-assume_charset=UTF-8', '-pseudo_inlines',
+    '-dont_wrap_pre', '-source',
+)
+# The status line lynx writes to its -error_file, e.g. "STATUS=HTTP/1.1 503 Service Unavailable"
+LYNX_STATUS_PATTERN = re.compile(r'^STATUS=HTTP/\S+\s+(\d{3})', re.MULTILINE)
+# Responses worth retrying a title fetch for: rate limiting and server errors
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
 
 # Copy all the remaining functions from the original file here
+@functools.lru_cache(maxsize=4096)
 def simplify_url(url: str) -> str:
-    """Simplifies the URL by removing advertising campaign information."""
-    removable_keys = set(config['removable_keys'])
+    """Simplifies the URL by removing advertising campaign information. Results are cached per URL."""
     parsed_url = urlparse(url)
-    query_params = parse_qs(parsed_url.query)
-    filtered_query_params = {k: v for k, v in query_params.items() if k not in removable_keys}
-    simplified_query = '&'.join([f"{k}={v[0]}" for k, v in filtered_query_params.items()])
+    # Most URLs carry no query string at all; skip decoding and re-encoding an empty one
+    if parsed_url.query:
+        query_params = parse_qs(parsed_url.query)
+        # Keep the original k=v join (first value, no re-encoding) so entries already in
+        # references.md still match their simplified form
+        simplified_query = '&'.join([f"{k}={v[0]}" for k, v in query_params.items() if k not in REMOVABLE_KEYS])
+    else:
+        simplified_query = ''
     
     if simplified_query:
         simplified_url = parsed_url._replace(query=simplified_query).geturl()
     else:
         simplified_url = parsed_url._replace(query=None).geturl()
     
-    logging.debug(f"Simplified URL: {simplified_url}")
+    logging.debug("Simplified URL: %s", simplified_url)
     return simplified_url
 
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """
+    Returns the shared HTTP session, creating it on first use. Reusing one session
+    keeps connections (and TLS sessions) alive across URLs instead of reconnecting per call.
+    requests is imported here rather than at module load, since most commands never need it.
+
+    Returns:
+        requests.Session: A session with retrying, pooled adapters mounted for http and https.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["HEAD", "GET", "OPTIONS"]  # Allow these methods to retry
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry_strategy)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@functools.lru_cache(maxsize=1)
+def get_redirect_cache() -> sqlite3.Connection:
+    """
+    Opens the on-disk redirect cache on first use, creating the file and table if needed
+    and deleting entries older than REDIRECT_CACHE_TTL, so the file does not grow without bound.
+
+    Returns:
+        sqlite3.Connection: A connection that may be shared between threads under REDIRECT_CACHE_LOCK.
+    """
+    os.makedirs(os.path.dirname(REDIRECT_CACHE_FILE), exist_ok=True)
+    connection = sqlite3.connect(REDIRECT_CACHE_FILE, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("CREATE TABLE IF NOT EXISTS redirects (url TEXT PRIMARY KEY, resolved TEXT NOT NULL, ts REAL NOT NULL)")
+    connection.execute("DELETE FROM redirects WHERE ts < ?", (time.time() - REDIRECT_CACHE_TTL,))
+    return connection
+
+def load_cached_redirect(url: str) -> str:
+    """
+    Looks up a redirect resolved by an earlier run that has not expired yet.
+
+    Args:
+        url (str): The original URL.
+
+    Returns:
+        str: The cached final URL, or None if there is no usable entry.
+    """
+    try:
+        with REDIRECT_CACHE_LOCK:
+            row = get_redirect_cache().execute(
+                "SELECT resolved FROM redirects WHERE url = ? AND ts >= ?",
+                (url, time.time() - REDIRECT_CACHE_TTL),
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        logging.warning("Redirect cache unavailable: %s", e)
+        return None
+    return row[0] if row else None
+
+def store_cached_redirect(url: str, resolved_url: str) -> None:
+    """
+    Records a resolved redirect so later runs can skip the network request.
+
+    Args:
+        url (str): The original URL.
+        resolved_url (str): The final URL it resolved to.
+    """
+    try:
+        with REDIRECT_CACHE_LOCK:
+            get_redirect_cache().execute(
+                "INSERT OR REPLACE INTO redirects (url, resolved, ts) VALUES (?, ?, ?)",
+                (url, resolved_url, time.time()),
+            )
+    except (sqlite3.Error, OSError) as e:
+        logging.warning("Could not update the redirect cache: %s", e)
+
 def resolve_redirect(url: str) -> str:
     """
     Resolves the final URL after following any redirects. Specifically handles YouTube redirect URLs.
+    Successful resolutions are memoized for the life of the process, so a URL repeated within a run
+    is fetched once, and are also kept in the on-disk redirect cache for later runs. A failed request
+    is not memoized, so a later call for the same URL tries again.
 
     Args:
         url (str): The original URL to resolve.
@@ -136,93 +306,186 @@ def resolve_redirect(url: str) -> str:
     Returns:
         str: The final URL after following redirects.
     """
-    youtube_redirect_pattern = re.compile(r'https://www\.youtube\.com/redirect\?')
-    if youtube_redirect_pattern.match(url):
+    if YOUTUBE_REDIRECT_PATTERN.match(url):
         parsed_url = urlparse(url)
         query_params = parse_qs(parsed_url.query)
         if 'q' in query_params:
             return query_params['q'][0]
     
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]  # Allow these methods to retry
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    
+    with RESOLVED_REDIRECTS_LOCK:
+        cached_url = RESOLVED_REDIRECTS.get(url)
+    if cached_url is None:
+        cached_url = load_cached_redirect(url)
+    if cached_url is not None:
+        with RESOLVED_REDIRECTS_LOCK:
+            RESOLVED_REDIRECTS[url] = cached_url
+        return cached_url
+
+    import requests
+    from urllib3.exceptions import InsecureRequestWarning
+
     with warnings.catch_warnings():
         warnings.simplefilter('ignore', InsecureRequestWarning)
         try:
-            # First try with headers that mimic a browser
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Connection': 'keep-alive',
-            }
-            response = session.get(url, 
-                                 allow_redirects=True, 
-                                 verify=False, 
-                                 timeout=10,
-                                 headers=headers)
+            # Follow the redirect chain with HEAD requests (headers that mimic a browser),
+            # so no response body is downloaded just to learn the final URL
+            session = get_http_session()
+            request_options = dict(allow_redirects=True, verify=False, timeout=10, headers=BROWSER_HEADERS)
+            response = session.head(url, **request_options)
+            final_url = response.url
+            if response.status_code >= 400:
+                # Some servers reject or mishandle HEAD; fall back to a GET, but stop at the headers
+                with session.get(url, stream=True, **request_options) as response:
+                    final_url = response.url
             
             # If we got redirected to the homepage, return the original URL
-            if response.url == "https://www.msn.com/" and url != "https://www.msn.com/":
-                logging.debug(f"Prevented incorrect redirect to homepage, keeping original URL: {url}")
-                return url
-                
-            return response.url
+            if final_url == "https://www.msn.com/" and url != "https://www.msn.com/":
+                logging.debug("Prevented incorrect redirect to homepage, keeping original URL: %s", url)
+                final_url = url
+
+            # Error responses may be temporary, so only a successful resolution is remembered
+            if response.status_code < 400:
+                store_cached_redirect(url, final_url)
+                with RESOLVED_REDIRECTS_LOCK:
+                    RESOLVED_REDIRECTS[url] = final_url
+            return final_url
         except requests.exceptions.RequestException as e:
-            logging.error(f"Error resolving redirect for URL: {url}, error: {e}")
+            logging.error("Error resolving redirect for URL: %s, error: %s", url, e)
             return url
 
-def get_title_from_url(url: str) -> str:
+# Title candidates in order of preference: <title>, OpenGraph, Twitter card, first <h1>
+TITLE_XPATHS = (
+    'string(//title)',
+    'string(//meta[@property="og:title"]/@content)',
+    'string(//meta[@name="twitter:title"]/@content)',
+    'string((//h1)[1])',
+)
+# The candidates above that live in <head>, which is usually a small prefix of the page
+HEAD_TITLE_XPATHS = TITLE_XPATHS[:3]
+HEAD_END_PATTERN = re.compile(rb'</head\s*>', re.IGNORECASE)
+# A page that declares its encoding is left to lxml; anything else is treated as UTF-8
+DECLARED_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset|<\?xml[^>]+encoding', re.IGNORECASE)
+
+def extract_title(html: bytes) -> str:
     """
-    Fetches the title of a webpage given its URL by dumping HTML with lynx and parsing it.
+    Extracts the best available title from an HTML document using lxml XPath queries.
+    The <head> is parsed on its own first; the whole page is only parsed when the head
+    has no usable title and the <h1> fallback is needed.
 
     Args:
-        url (str): The URL of the webpage.
+        html (bytes): The raw HTML source of the page. Pages that declare a charset are
+            decoded by lxml; undeclared ones are decoded as UTF-8, since lynx is run with
+            -assume_charset=UTF-8 and lxml would otherwise fall back to latin-1.
 
     Returns:
-        str: The title of the webpage, or an error message if the title cannot be fetched.
+        str: The first non-empty title candidate, or None if the page has none.
     """
-    lynx_command = f'lynx -dump -nolist -force_html -hiddenlinks=ignore -display_charset=UTF-8 -assume_charset=UTF-8 -pseudo_inlines -dont_wrap_pre -source "{url}"'
+    head_end = HEAD_END_PATTERN.search(html)
+    candidates = [(html, TITLE_XPATHS)]
+    if head_end:
+        candidates.insert(0, (html[:head_end.end()], HEAD_TITLE_XPATHS))
+    charset_declared = DECLARED_CHARSET_PATTERN.search(html, 0, head_end.end() if head_end else len(html))
+
+    for document, queries in candidates:
+        if not charset_declared:
+            document = document.decode('utf-8', 'replace')
+        try:
+            tree = lxml.html.document_fromstring(document)
+        except ParserError:
+            continue
+        for query in queries:
+            title = tree.xpath(query).strip()
+            if title:
+                return title
+    return None
+
+def fetch_with_retries(fetch, retry_reason, description: str):
+    """
+    Calls fetch while holding one of the FETCH_SLOTS, retrying with exponential backoff while
+    the attempt failed in a way worth retrying. The slot is released before waiting, so a
+    backing-off fetch does not hold up others. Exceptions raised by fetch are not retried.
 
-    try:
-        result = subprocess.run(lynx_command, shell=True, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            logging.error(f"Lynx command failed with return code {result.returncode}")
-            return f"Error: Lynx command failed with return code {result.returncode}"
+    Args:
+        fetch: A callable taking no arguments that performs one attempt.
+        retry_reason: A callable taking an attempt's result and returning why it should be
+            retried, or None if the result is final.
+        description (str): What is being fetched, for the retry log message.
 
-        soup = BeautifulSoup(result.stdout, 'html.parser')
+    Returns:
+        The result of the first final attempt, or of the last attempt if none was final.
+    """
+    for attempt in range(1, FETCH_ATTEMPTS + 1):
+        with FETCH_SLOTS:
+            result = fetch()
+        reason = retry_reason(result)
+        if reason is None or attempt == FETCH_ATTEMPTS:
+            return result
+        delay = FETCH_BACKOFF * 2 ** (attempt - 1)
+        logging.warning("Fetching %s failed (%s), retrying in %.1fs", description, reason, delay)
+        time.sleep(delay)
+
+def lynx_retry_reason(result: tuple) -> str:
+    """
+    Decides whether a lynx fetch is worth retrying: only when the server answered with a
+    rate-limit or server error. Timeouts, DNS failures and other errors are final.
 
-        title = None
+    Args:
+        result (tuple): The CompletedProcess and the HTTP status lynx reported, or None.
 
-        if soup.title:
-            title = soup.title.string.strip()
+    Returns:
+        str: Why the fetch should be retried, or None if it should not.
+    """
+    _, status = result
+    if status in RETRYABLE_STATUSES:
+        return f"HTTP {status}"
+    return None
 
-        if not title:
-            og_title = soup.find('meta', property='og:title')
-            if og_title:
-                title = og_title.get('content', '').strip()
+@functools.lru_cache(maxsize=1)
+def find_lynx() -> str:
+    """
+    Locates the lynx executable on first use, so commands that never fetch a title do not
+    search PATH, and later title fetches reuse the result.
 
-        if not title:
-            twitter_title = soup.find('meta', name='twitter:title')
-            if twitter_title:
-                title = twitter_title.get('content', '').strip()
+    Returns:
+        str: The path to lynx, or None if it is not installed.
+    """
+    return shutil.which('lynx')
 
-        if not title:
-            h1 = soup.find('h1')
-            if h1:
-                title = h1.get_text().strip()
+def get_title_from_url(url: str) -> str:
+    """
+    Fetches the title of a webpage given its URL by dumping HTML with lynx and parsing it.
+
+    Args:
+        url (str): The URL of the webpage.
+
+    Returns:
+        str: The title of the webpage, or an error message if the title cannot be fetched.
+    """
+    lynx_path = find_lynx()
+    if lynx_path is None:
+        logging.error("lynx was not found on PATH")
+        return "Error: lynx is not installed"
+
+    def run_lynx() -> tuple:
+        # lynx reports the HTTP status through -error_file, not its exit code
+        fd, status_path = tempfile.mkstemp(prefix=".ref-lynx.", suffix=".status")
+        os.close(fd)
+        try:
+            result = subprocess.run([lynx_path, *LYNX_OPTIONS, f"-error_file={status_path}", url],
+                                    capture_output=True, timeout=30)
+            with open(status_path, 'r', errors='replace') as status_file:
+                status = LYNX_STATUS_PATTERN.search(status_file.read())
+        finally:
+            os.remove(status_path)
+        return result, int(status.group(1)) if status else None
+
+    try:
+        result, _ = fetch_with_retries(run_lynx, lynx_retry_reason, f"the title of {url}")
+        result.check_returncode()
+        title = extract_title(result.stdout)
 
         if title:
-            logging.info(f"Title found: {title}")
+            logging.info("Title found: %s", title)
             return title
         else:
             logging.warning("No suitable title found in the HTML content")
@@ -231,27 +494,52 @@ def get_title_from_url(url: str) -> str:
     except subprocess.TimeoutExpired:
         logging.error("Lynx command timed out")
         return "Error: Request timed out"
+    except subprocess.CalledProcessError as e:
+        logging.error("Lynx command failed with return code %s", e.returncode)
+        return f"Error: Lynx command failed with return code {e.returncode}"
     except subprocess.SubprocessError as e:
-        logging.error(f"Subprocess error occurred: {e}")
+        logging.error("Subprocess error occurred: %s", e)
         return f"Error: Subprocess error - {e}"
     except Exception as e:
-        logging.error(f"An unexpected error occurred: {e}")
+        logging.error("An unexpected error occurred: %s", e)
         return f"Error: Unexpected error - {e}"
 
+def iter_file_lines(file_path: str):
+    """
+    Yields the lines of a file as bytes, read through a read-only memory map so large
+    files are scanned without copying them through Python's text I/O layer.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Yields:
+        bytes: Each line of the file, including its trailing newline.
+    """
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Hint a front-to-back scan so the kernel reads ahead aggressively (POSIX, Python 3.8+)
+            for advice in ('MADV_SEQUENTIAL', 'MADV_WILLNEED'):
+                if hasattr(mm, 'madvise') and hasattr(mmap, advice):
+                    mm.madvise(getattr(mmap, advice))
+            yield from iter(mm.readline, b'')
+
 def check_integrity():
     """
     Checks the integrity of the 'references.md' file to ensure that each line follows the expected format.
+    Errors are yielded as they are found, so callers can report them without holding them all.
     
-    Returns:
-        list: A list of tuples containing details of lines that do not match the expected format.
+    Yields:
+        tuple: Details of each line that does not match the expected format.
     """
-    errors = []
-    with open(UNIFIED, "r") as file:
-        for line_number, line in enumerate(file, start=1):
-            if not re.match(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\|\[.*\]\(.*\)\|\(.*\)\|.*\|(YouTube|General)\n$', line):
-                expected_line = f'{datetime.now().isoformat()}|[URL]|(Title)|Source|(YouTube|General)'
-                errors.append((f"references.md", line_number, line.strip(), expected_line))
-    return errors
+    # The example line only needs a timestamp once per scan, not once per bad line
+    expected_line = f'{time.strftime(ENTRY_TIME_FORMAT)}{EXPECTED_LINE_SUFFIX}'
+    matches_format = INTEGRITY_PATTERN_BYTES.match
+    for line_number, line in enumerate(iter_file_lines(UNIFIED), start=1):
+        if not matches_format(line):
+            yield (f"references.md", line_number, line.decode('utf-8', 'replace').strip(), expected_line)
 
 def set_developer_key():
     """Prompts the user to enter their YouTube API key and sets it in the environment variables."""
@@ -260,6 +548,36 @@ def set_developer_key():
     set_key(env_path, 'YOUTUBE_API_KEY', key)
     print("YOUTUBE_API_KEY set successfully!")
 
+# YouTube API clients built by each thread; their httplib2 transport is not thread-safe
+youtube_clients = threading.local()
+
+def get_youtube_client(developer_key: str):
+    """
+    Returns a YouTube Data API client for the given key, building it once per key and thread.
+    Clients are not shared between threads, since the underlying httplib2.Http is not
+    thread-safe; worker threads in read_urls_from_file are reused, so each builds at most one.
+    The discovery document bundled with google-api-python-client is used, so building
+    the client does not need a network round-trip.
+
+    Args:
+        developer_key (str): The YouTube API key.
+
+    Returns:
+        The YouTube API client.
+    """
+    clients = getattr(youtube_clients, 'clients', None)
+    if clients is None:
+        clients = youtube_clients.clients = {}
+    client = clients.get(developer_key)
+    if client is None:
+        # googleapiclient is by far the slowest import, so it is only loaded when a client is needed
+        from googleapiclient.discovery import build
+
+        client = clients[developer_key] = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION,
+                                                developerKey=developer_key,
+                                                cache_discovery=False, static_discovery=True)
+    return client
+
 def get_youtube_data(url: str) -> tuple:
     """
     Fetches YouTube video or playlist data using the YouTube Data API.
@@ -274,7 +592,7 @@ def get_youtube_data(url: str) -> tuple:
     Raises:
         ValueError: If the YouTube URL is invalid.
     """
-    youtube = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=DEVELOPER_KEY)
+    youtube = get_youtube_client(DEVELOPER_KEY)
     parsed_url = urlparse(url)
     query_params = parse_qs(parsed_url.query)
     
@@ -283,11 +601,11 @@ def get_youtube_data(url: str) -> tuple:
     
     video_id = query_params.get('v')
     if not video_id:
-        shorts_match = re.match(r'/shorts/([^/?]+)', parsed_url.path)
+        shorts_match = SHORTS_PATH_PATTERN.match(parsed_url.path)
         if shorts_match:
             video_id = shorts_match.group(1)
         else:
-            live_match = re.match(r'/live/([^/?]+)', parsed_url.path)
+            live_match = LIVE_PATH_PATTERN.match(parsed_url.path)
             if live_match:
                 video_id = live_match.group(1)
             else:
@@ -295,7 +613,7 @@ def get_youtube_data(url: str) -> tuple:
     
     if isinstance(video_id, list):
         video_id = video_id[0]
-    video_response = youtube.videos().list(part='snippet', id=video_id).execute()
+    video_response = youtube.videos().list(part='snippet', id=video_id).execute(num_retries=API_RETRIES)
     video_data = video_response['items'][0]['snippet']
     return video_id, video_data['title'], video_data['channelTitle']
 
@@ -312,15 +630,20 @@ def get_youtube_playlist_data(playlist_id: str, youtube) -> tuple:
                Each video tuple contains video ID, title, and uploader.
     """
     # Get playlist metadata
-    playlist_response = youtube.playlists().list(part='snippet', id=playlist_id).execute()
-    if not playlist_response['items']:
+    playlist_response = youtube.playlists().list(
+        part='snippet',
+        id=playlist_id,
+        fields=PLAYLIST_FIELDS
+    ).execute(num_retries=API_RETRIES)
+    if not playlist_response.get('items'):
         raise ValueError("Invalid YouTube Playlist ID")
 
     playlist_snippet = playlist_response['items'][0]['snippet']
     playlist_title = playlist_snippet['title']
     playlist_uploader = playlist_snippet['channelTitle']
 
-    # Get videos in the playlist
+    # Get videos in the playlist. Pages are chained by nextPageToken, so they cannot be
+    # fetched concurrently; request only the fields we read to keep each page small.
     video_details = []
     next_page_token = None
     while True:
@@ -328,9 +651,10 @@ def get_youtube_playlist_data(playlist_id: str, youtube) -> tuple:
             part='snippet',
             maxResults=50,
             playlistId=playlist_id,
-            pageToken=next_page_token
-        ).execute()
-        for item in playlist_items_response['items']:
+            pageToken=next_page_token,
+            fields=PLAYLIST_ITEM_FIELDS
+        ).execute(num_retries=API_RETRIES)
+        for item in playlist_items_response.get('items', []):
             video_id = item['snippet']['resourceId']['videoId']
             title = item['snippet']['title']
             uploader = item['snippet']['channelTitle']
@@ -341,18 +665,65 @@ def get_youtube_playlist_data(playlist_id: str, youtube) -> tuple:
 
     return playlist_title, playlist_uploader, video_details
 
+# Files already created or confirmed by ensure_path_exists during this run
+ensured_paths = set()
+
 def ensure_path_exists(file_path: str):
     """
     Ensures that the directory and file specified by `file_path` exist. Creates them if they do not exist.
+    Each path is only checked once per run, so repeated appends do not repeat the mkdir and touch.
     
     Args:
         file_path (str): The path to the file to ensure existence.
     """
-    directory = os.path.dirname(file_path)
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    if not os.path.exists(file_path):
-        open(file_path, 'w').close()
+    if file_path in ensured_paths:
+        return
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # O_CREAT without a write creates a missing file but leaves an existing one's mtime alone,
+    # unlike touch(), so read-only commands and backups keep the file's real timestamps
+    os.close(os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o666))
+    ensured_paths.add(file_path)
+
+# Per-thread set of files whose fsync is deferred by batched_writes
+write_batch = threading.local()
+
+@contextlib.contextmanager
+def batched_writes(pending_syncs: set = None):
+    """
+    Defers the fsync done by append_to_file until the end of the block, so a run of
+    appends (e.g. every video in a playlist) costs one disk flush per file instead of
+    one per line. Lines are still flushed to the OS immediately and remain visible to
+    readers; only the durability barrier is batched.
+
+    Args:
+        pending_syncs (set, optional): The set yielded by a batch opened on another thread.
+            Passing it lets a worker thread join that batch, which then does the syncing.
+
+    Yields:
+        set: The paths awaiting an fsync in the batch this block belongs to.
+    """
+    if getattr(write_batch, 'paths', None) is not None:
+        # Already inside a batch; the outermost block does the syncing
+        yield write_batch.paths
+        return
+
+    if pending_syncs is not None:
+        write_batch.paths = pending_syncs
+        try:
+            yield pending_syncs
+        finally:
+            write_batch.paths = None
+        return
+
+    write_batch.paths = set()
+    try:
+        yield write_batch.paths
+    finally:
+        paths, write_batch.paths = write_batch.paths, None
+        for path in paths:
+            with open(path, "a") as f:
+                os.fsync(f.fileno())
 
 def append_to_file(file_path: str, line: str) -> None:
     """
@@ -363,10 +734,112 @@ def append_to_file(file_path: str, line: str) -> None:
         line (str): The line to append to the file.
     """
     ensure_path_exists(file_path)
-    with open(file_path, "a") as f:
-        f.write(line)
-        f.flush()
-        os.fsync(f.fileno())
+    with UNIFIED_LOCK:
+        index = reference_indexes.get(file_path)
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            # Deleted or rotated since it was first ensured this run; recreate it and
+            # forget the index, which described the old file
+            ensured_paths.discard(file_path)
+            ensure_path_exists(file_path)
+            reference_indexes.pop(file_path, None)
+            index = None
+            stat = os.stat(file_path)
+        index_is_current = index is not None and index['key'] == (stat.st_size, stat.st_mtime_ns)
+
+        with open(file_path, "a") as f:
+            f.write(line)
+            f.flush()
+            pending_syncs = getattr(write_batch, 'paths', None)
+            if pending_syncs is None:
+                os.fsync(f.fileno())
+            else:
+                pending_syncs.add(file_path)
+
+        # Keep a current index in step with the append instead of rescanning the file
+        if index_is_current:
+            index_reference_line(index, line)
+            stat = os.stat(file_path)
+            index['key'] = (stat.st_size, stat.st_mtime_ns)
+
+def replace_file_lines(file_path: str, lines: list) -> None:
+    """
+    Atomically replaces the contents of a file. The lines are written to a temporary file
+    in the same directory and renamed over the original, so a crash mid-write can never
+    leave a truncated file behind.
+
+    Args:
+        file_path (str): The path to the file to replace.
+        lines (list): The new lines of the file, including newlines.
+    """
+    # Rename over the symlink's target, not the link, so a linked file stays linked
+    file_path = os.path.realpath(file_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            tmp_file.writelines(lines)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.chmod(tmp_path, os.stat(file_path).st_mode & 0o777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# Searchable fields of a references.md line: field name -> (column index, hit type label)
+SEARCH_FIELDS = {
+    "date": (0, "Date"),
+    "url": (1, "Url"),
+    "title": (2, "Title"),
+    "uploader": (3, "Uploader"),
+    "source": (4, "Source"),
+}
+# Fields searched by --search
+ALL_SEARCH_FIELDS = ("url", "title", "date", "source", "uploader")
+# Single-field search options, in the order main() gives them precedence
+SINGLE_FIELD_SEARCHES = {
+    "search_url": "url",
+    "search_title": "title",
+    "search_date": "date",
+    "search_source": "source",
+    "search_uploader": "uploader",
+}
+
+def find_field_hits(line, needle, separator) -> set:
+    """
+    Finds which separator-delimited fields of a line contain needle. The whole line is
+    scanned once for occurrences, and each occurrence is attributed to the field it falls
+    in, rather than slicing out and searching every field separately. Occurrences that
+    span a separator do not count, matching a per-field search.
+
+    Args:
+        line (bytes or str): The (already case-folded) line to search.
+        needle (bytes or str): The (already case-folded) term to look for.
+        separator (bytes or str): The field separator.
+
+    Returns:
+        set: The column indexes of the fields that contain needle.
+    """
+    columns = set()
+    position = line.find(needle)
+    if position < 0:
+        return columns
+
+    starts = [0]
+    separator_position = line.find(separator)
+    while separator_position >= 0:
+        starts.append(separator_position + 1)
+        separator_position = line.find(separator, separator_position + 1)
+    ends = [start - 1 for start in starts[1:]] + [len(line)]
+
+    while position >= 0:
+        column = bisect.bisect_right(starts, position) - 1
+        if position + len(needle) <= ends[column]:
+            columns.add(column)
+        position = line.find(needle, position + 1)
+    return columns
 
 def search_entries(search_term: str, search_field: str, file_path: str) -> dict:
     """
@@ -378,35 +851,70 @@ def search_entries(search_term: str, search_field: str, file_path: str) -> dict:
         file_path (str): The path to the file where the search will be conducted.
 
     Returns:
-        dict: A dictionary where keys are lines from the file that match the search criteria and values are lists of hit types.
+        dict: A dictionary where keys are lines from the file that match the search criteria and values are sets of hit types.
+    """
+    return search_entries_multi(search_term, [search_field], file_path)
+
+def print_search_results(results: dict):
+    """
+    Prints each matching line followed by the types of hit it produced.
+
+    Args:
+        results (dict): The result of search_entries or search_entries_multi.
+    """
+    output = []
+    for line, hit_types in results.items():
+        output.append(line.strip() + "\n")
+        output.extend(f"-Hit Type: {hit_type}\n" for hit_type in hit_types)
+    sys.stdout.writelines(output)
+
+def search_entries_multi(search_term: str, search_fields: list, file_path: str) -> dict:
+    """
+    Searches for entries matching a term in any of several fields, reading the file once.
+
+    Args:
+        search_term (str): The term to search for within the specified fields.
+        search_fields (list): The fields to search within. Valid options are "url", "title", "date", "source", and "uploader".
+        file_path (str): The path to the file where the search will be conducted.
+
+    Returns:
+        dict: A dictionary where keys are lines from the file that match the search criteria and values are sets of hit types.
     """
     results = {}
     search_term_lower = search_term.lower()
-
-    with open(file_path, "r") as file:
-        for line in file:
-            fields = line.split('|')
-            if len(fields) < 5:
-                logging.warning(f"Line does not have the expected number of fields: {line.strip()}")
+    # ASCII terms can be matched against the raw bytes; anything else needs decoded, case-folded text
+    search_bytes = search_term_lower.isascii()
+    needle = search_term_lower.encode() if search_bytes else search_term_lower
+    # Terms without letters (dates, for instance) can be looked for without case-folding each line
+    fold_case = search_term_lower != search_term.upper()
+    wanted = [SEARCH_FIELDS[field] for field in search_fields if field in SEARCH_FIELDS]
+
+    for raw_line in iter_file_lines(file_path):
+        if raw_line.count(b'|') < 4:
+            if logging.getLogger().isEnabledFor(logging.WARNING):
+                logging.warning("Line does not have the expected number of fields: %s", raw_line.decode('utf-8', 'replace').strip())
+            continue
+
+        # Reject lines that cannot contain the term before doing any per-field work
+        if search_bytes:
+            haystack = raw_line.lower() if fold_case else raw_line
+            if needle not in haystack:
                 continue
+            columns = find_field_hits(haystack, needle, b'|')
+        else:
+            # A non-ASCII term cannot occur in a line that is pure ASCII, even after case-folding
+            if raw_line.isascii():
+                continue
+            haystack = raw_line.decode('utf-8', 'replace')
+            if fold_case:
+                haystack = haystack.lower()
+            if needle not in haystack:
+                continue
+            columns = find_field_hits(haystack, needle, '|')
+        hit_types = {hit_type for column, hit_type in wanted if column in columns}
 
-            hit_types = []
-            if search_field == "url" and search_term_lower in fields[1].lower():
-                hit_types.append("Url")
-            elif search_field == "title" and search_term_lower in fields[2].lower():
-                hit_types.append("Title")
-            elif search_field == "date" and search_term_lower in fields[0].lower():
-                hit_types.append("Date")
-            elif search_field == "source" and search_term_lower in fields[4].lower():
-                hit_types.append("Source")
-            elif search_field == "uploader" and search_term_lower in fields[3].lower():
-                hit_types.append("Uploader")
-
-            if hit_types:
-                if line not in results:
-                    results[line] = hit_types
-                else:
-                    results[line].extend(hit_types)
+        if hit_types:
+            results.setdefault(raw_line.decode('utf-8', 'replace'), set()).update(hit_types)
 
     return results
 
@@ -417,32 +925,34 @@ def update_transcript(url: str) -> None:
     Args:
         url (str): The URL of the YouTube video to update.
     """
-    with open(UNIFIED, 'r') as file:
-        lines = file.readlines()
+    with UNIFIED_LOCK:
+        with open(UNIFIED, 'r') as file:
+            lines = file.readlines()
 
-    updated = False
-    with open(UNIFIED, 'w') as file:
-        for line in lines:
+        updated = False
+        for i, line in enumerate(lines):
             if url in line and line.strip().endswith("|None"):
-                video_id = re.search(r'v=([^&]+)', url).group(1)
+                video_id = VIDEO_ID_QUERY_PATTERN.search(url).group(1)
                 transcript_file = fetch_youtube_transcript(video_id)
                 if transcript_file:
-                    line = line.replace("|None", f"|{transcript_file}")
+                    lines[i] = line.replace("|None", f"|{transcript_file}")
                     updated = True
-                    logging.info(f"Transcript updated for URL: {url}")
-            file.write(line)
+                    logging.info("Transcript updated for URL: %s", url)
+
+        if updated:
+            replace_file_lines(UNIFIED, lines)
 
     if updated:
         print(f"Transcript for {url} has been updated.")
     else:
         print(f"No matching entry found for {url} or transcript already exists.")
 
-def parse_arguments() -> argparse.Namespace:
+def build_parser() -> argparse.ArgumentParser:
     """
-    Parses command-line arguments and returns the parsed arguments as a Namespace object.
+    Builds the command-line parser.
 
     Returns:
-        argparse.Namespace: The parsed command-line arguments.
+        argparse.ArgumentParser: The configured parser.
     """
     parser = argparse.ArgumentParser(description="Add or search URL entries in markdown files.")
     parser.add_argument("url", nargs='?', default=None, help="URL to be added.")
@@ -459,15 +969,71 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument("--search", help="Search entries across all fields (URL, title, date, source, uploader).")
     parser.add_argument("--transcript", action="store_true", help="Update the transcript for an existing YouTube entry.")
     parser.add_argument("--file", help="Read URLs from a file (one URL per line)")
+    parser.add_argument("-j", "--jobs", type=int, default=FILE_WORKERS, help=f"Number of URLs from --file to process in parallel (default: {FILE_WORKERS}).")
     parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    return parser
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses command-line arguments and returns the parsed arguments as a Namespace object.
+
+    Returns:
+        argparse.Namespace: The parsed command-line arguments.
+    """
+    parser = build_parser()
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
     if args.edit:
         os.system(f"vim {UNIFIED}")
         sys.exit()
-    if args.url:
-        args.url = args.url.replace('&', '\\&')
     return args
 
+# Per-file index of recorded URLs, see load_reference_index
+reference_indexes = {}
+
+def index_reference_line(index: dict, line: str) -> None:
+    """
+    Adds a single references.md line to an index built by load_reference_index.
+
+    Args:
+        index (dict): The index to update.
+        line (str): The line to add.
+    """
+    match = REFERENCE_URL_PATTERN.search(line)
+    if not match:
+        return
+    url = match.group(1)
+    index['urls'].add(url)
+    # Only the optional sixth field (the transcript) matters, so avoid splitting the whole line
+    if line.count('|') >= 5 and line.rstrip().rsplit('|', 1)[1] != "None":
+        index['transcripts'].add(url)
+
+def load_reference_index(file_path: str) -> dict:
+    """
+    Returns an in-memory index of the URLs recorded in a references file. The index is
+    rebuilt only when the file's size or modification time no longer match the last scan,
+    so repeated lookups during a run cost a stat() instead of a full file read.
+
+    Args:
+        file_path (str): The path to the references file.
+
+    Returns:
+        dict: 'urls' is the set of recorded URLs, and 'transcripts' is the set of URLs
+              whose entry references a transcript file.
+    """
+    stat = os.stat(file_path)
+    key = (stat.st_size, stat.st_mtime_ns)
+    with UNIFIED_LOCK:
+        index = reference_indexes.get(file_path)
+        if index is None or index['key'] != key:
+            index = {'key': key, 'urls': set(), 'transcripts': set()}
+            with open(file_path, "r") as f:
+                for line in f:
+                    index_reference_line(index, line)
+            reference_indexes[file_path] = index
+        return index
+
 def url_exists_in_file(url: str, file_path: str) -> bool:
     """
     Checks if a URL already exists in the specified file.
@@ -479,57 +1045,128 @@ def url_exists_in_file(url: str, file_path: str) -> bool:
     Returns:
         bool: True if the URL exists in the file, False otherwise.
     """
-    with open(file_path, "r") as f:
-        for line in f:
-            match = re.search(r'\[([^\]]+)\]', line)
-            if match and match.group(1) == url:
-                return True
-    return False
+    return url in load_reference_index(file_path)['urls']
 
-def read_urls_from_file(file_path: str, force: bool = False) -> None:
+def read_urls_from_file(file_path: str, force: bool = False, jobs: int = FILE_WORKERS) -> None:
     """
-    Reads URLs from a file and processes each one sequentially.
-    Comments out successfully processed URLs in the original file.
+    Reads URLs from a file and processes them concurrently on a thread pool.
+    Requests to the same host are serialized to stay polite to that host: each host's URLs
+    wait in their own queue, which one worker drains while the others serve other hosts.
+    URLs that normalize to the same address are only processed once.
+    Comments out successfully processed URLs in the original file. On Ctrl+C, URLs that
+    have not started yet are cancelled and the file is left unchanged.
     
     Args:
         file_path (str): Path to the file containing URLs (one per line)
         force (bool): Whether to force processing even if URL exists
+        jobs (int): Number of URLs processed in parallel
     """
-    try:
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-
-        modified_lines = []
-        for line_number, line in enumerate(lines, 1):
-            original_line = line
-            url = line.strip()
-            
-            if not url or url.startswith('#'):
-                modified_lines.append(original_line)
-                continue
-
-            print(f"\nProcessing URL {line_number}: {url}")
+    host_queues = {}
+    host_queues_lock = threading.Lock()
+    stopping = threading.Event()
+
+    def drain_host(host: str, future: Future, line_number: int, url: str) -> None:
+        while True:
+            if stopping.is_set():
+                future.cancel()
+            elif future.set_running_or_notify_cancel():
+                try:
+                    with batched_writes(pending_syncs):
+                        print(f"\nProcessing URL {line_number}: {url}")
+                        process_url(url, force)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(None)
+            with host_queues_lock:
+                queue = host_queues[host]
+                if not queue:
+                    del host_queues[host]
+                    return
+                future, line_number, url = queue.popleft()
+
+    def schedule_line(line_number: int, url: str) -> Future:
+        future = Future()
+        host = urlparse(url).netloc
+        with host_queues_lock:
+            queue = host_queues.get(host)
+            if queue is not None:
+                # A worker is already draining this host; it picks this line up in turn
+                queue.append((future, line_number, url))
+                return future
+            host_queues[host] = deque()
+        executor.submit(drain_host, host, future, line_number, url)
+        return future
+
+    def write_result(output_file, line_number: int, line: str, url: str, future) -> None:
+        if future is not None:
             try:
-                process_url(url, force)
-                modified_lines.append(f"# {original_line}")
+                future.result()
+                line = f"# {line}"
                 print(f"Successfully processed and commented out: {url}")
             except Exception as e:
-                modified_lines.append(original_line)
                 print(f"Error processing URL on line {line_number}: {e}")
-                logging.error(f"Error processing URL '{url}' on line {line_number}: {e}")
-            
-            time.sleep(1)
+                logging.error("Error processing URL '%s' on line %s: %s", url, line_number, e)
+        output_file.write(line)
 
-        with open(file_path, 'w') as file:
-            file.writelines(modified_lines)
+    tmp_path = None
+    # The rewrite replaces the symlink's target, not the link, so a linked file stays linked
+    real_path = os.path.realpath(file_path)
+    try:
+        # Stream the input into a sibling temp file, keeping only a bounded window of
+        # in-flight lines, then swap it into place so the rewrite is atomic. Appends from
+        # all workers share one fsync batch, which completes before the input is rewritten.
+        with batched_writes() as pending_syncs, \
+                open(real_path, 'r') as input_file, \
+                tempfile.NamedTemporaryFile('w', dir=os.path.dirname(real_path),
+                                            prefix=f".{os.path.basename(real_path)}.", suffix=".tmp",
+                                            delete=False) as output_file, \
+                ThreadPoolExecutor(max_workers=jobs) as executor:
+            tmp_path = output_file.name
+            pending = deque()
+            # Lines that normalize to the same URL share one submission (and its outcome):
+            # normalized URL -> (first line number, future)
+            futures_by_url = {}
+            try:
+                for line_number, line in enumerate(input_file, 1):
+                    url = line.strip()
+                    future = None
+                    if url and not url.startswith('#'):
+                        normalized_url = simplify_url(translate_arxiv_url(url))
+                        if normalized_url in futures_by_url:
+                            first_line_number, future = futures_by_url[normalized_url]
+                            logging.debug("Duplicate of line %s on line %s: %s", first_line_number, line_number, url)
+                        else:
+                            future = schedule_line(line_number, url)
+                            futures_by_url[normalized_url] = (line_number, future)
+                    pending.append((line_number, line, url, future))
+                    # Write out whatever has finished in order, and only wait once the window is full
+                    while pending and (pending[0][3] is None or pending[0][3].done()):
+                        write_result(output_file, *pending.popleft())
+                    if len(pending) > FILE_WINDOW:
+                        write_result(output_file, *pending.popleft())
+                while pending:
+                    write_result(output_file, *pending.popleft())
+            except KeyboardInterrupt:
+                # Let running URLs finish, but do not start the queued ones
+                stopping.set()
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        os.chmod(tmp_path, os.stat(real_path).st_mode & 0o777)
+        os.replace(tmp_path, real_path)
+        tmp_path = None
 
         print("\nFinished processing all URLs from file.")
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found")
-        logging.error(f"File not found: {file_path}")
+        logging.error("File not found: %s", file_path)
     except Exception as e:
         print(f"Error reading file: {e}")
-        logging.error(f"Error reading file {file_path}: {e}")
+        logging.error("Error reading file %s: %s", file_path, e)
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 def fetch_youtube_transcript(video_id: str) -> str:
     """
@@ -542,18 +1179,43 @@ def fetch_youtube_transcript(video_id: str) -> str:
         str: The path to the saved transcript file.
     """
     transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{video_id}.json")
-    command = f"yt https://www.youtube.com/watch?v={video_id} > {transcript_file}"
+    command = ["yt", f"https://www.youtube.com/watch?v={video_id}"]
+    tmp_path = None
     try:
-        subprocess.run(command, shell=True, check=True)
-        logging.info(f"Transcript saved to: {transcript_file}")
+        os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
+        # Write to a temporary file and rename it into place, so an interrupted fetch
+        # never leaves a partial transcript under the final name
+        # Created with O_EXCL and mode 0o666 rather than mkstemp's 0o600, so the kernel applies
+        # the umask and the transcript ends up with the same mode open() would give it
+        candidate_path = os.path.join(TRANSCRIPTS_DIR, f".{video_id}.json.{os.urandom(4).hex()}.tmp")
+        os.close(os.open(candidate_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        tmp_path = candidate_path
+
+        def run_yt() -> subprocess.CompletedProcess:
+            # Reopened per attempt, so a retry does not append to a failed attempt's output
+            with open(tmp_path, 'w') as output:
+                return subprocess.run(command, stdout=output)
+
+        result = fetch_with_retries(
+            run_yt,
+            lambda result: f"exit status {result.returncode}" if result.returncode else None,
+            f"the transcript of {video_id}",
+        )
+        result.check_returncode()
+        os.replace(tmp_path, transcript_file)
+        tmp_path = None
+        logging.info("Transcript saved to: %s", transcript_file)
         return transcript_file
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Failed to fetch transcript for video ID {video_id}: {e}")
+    except (subprocess.CalledProcessError, OSError) as e:
+        logging.error("Failed to fetch transcript for video ID %s: %s", video_id, e)
         return None
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 def log_error(error_type: str, url: str, error_message: str) -> None:
     """
-    Logs an error to both the error log file and standard logging.
+    Logs an error to the error log file; the record also propagates to standard logging.
     
     Args:
         error_type (str): The type of error that occurred
@@ -562,7 +1224,6 @@ def log_error(error_type: str, url: str, error_message: str) -> None:
     """
     error_msg = f"{error_type} - URL: {url} - Error: {error_message}"
     error_logger.error(error_msg)
-    logging.error(error_msg)
 
 def translate_arxiv_url(url: str) -> str:
     """
@@ -578,36 +1239,88 @@ def translate_arxiv_url(url: str) -> str:
     if 'arxiv.org/pdf/' not in url:
         return url
 
-    arxiv_pdf_pattern = re.compile(r'(?:https?://)?arxiv\.org/pdf/(\d+\.\d+)')
-    if match := arxiv_pdf_pattern.search(url):
+    if match := ARXIV_PDF_PATTERN.search(url):
         article_id = match.group(1)
         article_url = f"https://arxiv.org/abs/{article_id}"
-        logging.debug(f"Translated arXiv PDF URL to article URL: {article_url}")
+        logging.debug("Translated arXiv PDF URL to article URL: %s", article_url)
         return article_url
     return url
 
+def list_transcript_files() -> set:
+    """
+    Lists the transcripts directory with a single scandir, so callers handling many
+    videos can test for existing transcripts without a stat() per video.
+
+    Returns:
+        set: The names of the files in the transcripts directory. record_video adds each
+            transcript it fetches, so the set stays current while it is reused.
+    """
+    try:
+        with os.scandir(TRANSCRIPTS_DIR) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def record_video(video_id: str, title: str, uploader: str, force: bool, existing_transcripts: set = None) -> str:
+    """
+    Records a single YouTube video in references.md, fetching its transcript if it is not
+    on disk yet. Videos that are already recorded with a transcript are skipped unless forced.
+
+    Args:
+        video_id (str): The YouTube video ID.
+        title (str): The video title as returned by the API.
+        uploader (str): The channel that uploaded the video.
+        force (bool): Whether to update the entry even if it is already complete.
+        existing_transcripts (set, optional): A listing from list_transcript_files to
+            check instead of stat'ing the transcript file; a fetched transcript is added to it.
+
+    Returns:
+        str: The cleaned-up title that was recorded.
+    """
+    title = NON_ALNUM_PATTERN.sub(' ', title).strip()
+    video_url = f"https://www.youtube.com/watch?v={video_id}"
+    transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{video_id}.json")
+    if existing_transcripts is None:
+        transcript_file_exists = os.path.exists(transcript_file)
+    else:
+        transcript_file_exists = os.path.basename(transcript_file) in existing_transcripts
+    index = load_reference_index(UNIFIED)
+
+    if force or not transcript_file_exists or video_url not in index['transcripts']:
+        if not transcript_file_exists:
+            transcript_file = fetch_youtube_transcript(video_id)
+            if transcript_file is None:
+                log_error("Transcript Retrieval", video_url, "Failed to fetch transcript")
+            elif existing_transcripts is not None:
+                existing_transcripts.add(os.path.basename(transcript_file))
+        update_reference_entry(video_url, title, uploader, transcript_file)
+    else:
+        print(f"URL {video_url} already recorded.")
+        logging.info("Duplicate URL: %s", video_url)
+    return title
+
 def process_url(url: str, force: bool) -> None:
     """
     Processes a given URL to extract and record relevant information.
     """
-    logging.debug(f"Original URL: {url}")
+    logging.debug("Original URL: %s", url)
     
     # Only translate if it's potentially an arXiv PDF URL
     url = translate_arxiv_url(url) if 'arxiv.org/pdf/' in url else url
-    logging.debug(f"URL after arXiv check: {url}")
+    logging.debug("URL after arXiv check: %s", url)
     
     try:
         resolved_url = resolve_redirect(url)
-        logging.debug(f"Resolved URL: {resolved_url}")
+        logging.debug("Resolved URL: %s", resolved_url)
         simplified_url = simplify_url(resolved_url)
-        logging.debug(f"Simplified URL after resolving redirects: {simplified_url}")
+        logging.debug("Simplified URL after resolving redirects: %s", simplified_url)
     except Exception as e:
         error_message = f"Failed to process URL: {e}"
         log_error("URL Processing", url, error_message)
         print(f"Error: {error_message}. Skipping...")
         raise
 
-    current_time = datetime.now().strftime('%Y-%m-%dT%H:%M:%S')
+    current_time = time.strftime(ENTRY_TIME_FORMAT)
     
     if "youtube.com" in simplified_url and not simplified_url.startswith('https://www.youtube.com/redirect'):
         try:
@@ -615,52 +1328,31 @@ def process_url(url: str, force: bool) -> None:
             if isinstance(result, tuple) and isinstance(result[2], list):  # Playlist
                 playlist_title, playlist_uploader, videos = result
                 playlist_url = simplified_url
-                if not url_exists_in_file(playlist_url, UNIFIED) or force:
-                    append_to_file(UNIFIED, f"{current_time}|[{playlist_url}]|({playlist_title})|{playlist_uploader}|YouTube\n")
-                    print(f"{current_time}|[{playlist_url}]|({playlist_title})|{playlist_uploader}|YouTube")
-                    logging.info(f"Added playlist URL: {playlist_url}")
-                for video_id, title, uploader in videos:
-                    title = re.sub('[^0-9a-zA-Z]+', ' ', title).strip()
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                    transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{video_id}.json")
-                    transcript_file_exists = os.path.exists(transcript_file)
-                    url_exists = url_exists_in_file(video_url, UNIFIED)
-
-                    if not url_exists or force or not transcript_file_exists or not reference_has_transcript(video_url):
-                        if not transcript_file_exists:
-                            transcript_file = fetch_youtube_transcript(video_id)
-                            if transcript_file is None:
-                                log_error("Transcript Retrieval", video_url, "Failed to fetch transcript")
-                        update_reference_entry(video_url, title, uploader, transcript_file)
-                    else:
-                        print(f"URL {video_url} already recorded.")
-                        logging.info(f"Duplicate URL: {video_url}")
+                # One fsync for the whole playlist rather than one per video
+                with batched_writes():
+                    with UNIFIED_LOCK:
+                        if not url_exists_in_file(playlist_url, UNIFIED) or force:
+                            append_to_file(UNIFIED, f"{current_time}|[{playlist_url}]|({playlist_title})|{playlist_uploader}|YouTube\n")
+                            print(f"{current_time}|[{playlist_url}]|({playlist_title})|{playlist_uploader}|YouTube")
+                            logging.info("Added playlist URL: %s", playlist_url)
+                    existing_transcripts = list_transcript_files()
+                    for video_id, title, uploader in videos:
+                        record_video(video_id, title, uploader, force, existing_transcripts)
             else:  # Single Video
                 video_id, title, uploader = result
-                title = re.sub('[^0-9a-zA-Z]+', ' ', title).strip()
-                video_url = f"https://www.youtube.com/watch?v={video_id}"
-                transcript_file = os.path.join(TRANSCRIPTS_DIR, f"{video_id}.json")
-                transcript_file_exists = os.path.exists(transcript_file)
-                url_exists = url_exists_in_file(video_url, UNIFIED)
-
-                if not url_exists or force or not transcript_file_exists or not reference_has_transcript(video_url):
-                    if not transcript_file_exists:
-                        transcript_file = fetch_youtube_transcript(video_id)
-                        if transcript_file is None:
-                            log_error("Transcript Retrieval", video_url, "Failed to fetch transcript")
-                    update_reference_entry(video_url, title, uploader, transcript_file)
-                    print(f"Title: {title}")
-                else:
-                    print(f"URL {video_url} already recorded.")
-                    print(f"Title: {title}")
-                    logging.info(f"Duplicate URL: {video_url}")
+                title = record_video(video_id, title, uploader, force)
+                print(f"Title: {title}")
         except ValueError as e:
             error_message = f"Invalid YouTube URL: {e}"
             log_error("YouTube Processing", simplified_url, error_message)
             print(f"Error: {error_message}")
+    elif url_exists_in_file(simplified_url, UNIFIED) and not force:
+        # Already recorded: don't spend a lynx fetch on a title that would be thrown away
+        print(f"URL {simplified_url} already recorded.")
+        logging.info("Duplicate URL: %s", simplified_url)
     else:
         title = get_title_from_url(simplified_url)
-        logging.debug(f"Fetched title: {title}")
+        logging.debug("Fetched title: %s", title)
         if title == "Dead link":
             log_error("URL Processing", simplified_url, "Dead link detected")
             print(f"Error: The URL {simplified_url} is a dead link.")
@@ -674,13 +1366,14 @@ def process_url(url: str, force: bool) -> None:
             log_error("URL Processing", simplified_url, title)
             print("Error: An unexpected error occurred.")
         elif title and not title.startswith("Error"):
-            if url_exists_in_file(simplified_url, UNIFIED) and not force:
-                print(f"URL {simplified_url} already recorded.")
-                logging.info(f"Duplicate URL: {simplified_url}")
-            else:
-                append_to_file(UNIFIED, f"{current_time}|[{simplified_url}]|({title})|General|General\n")
-                print(f"{current_time}|[{simplified_url}]|({title})|General|General")
-                logging.info(f"Added URL: {simplified_url}")
+            with UNIFIED_LOCK:
+                if url_exists_in_file(simplified_url, UNIFIED) and not force:
+                    print(f"URL {simplified_url} already recorded.")
+                    logging.info("Duplicate URL: %s", simplified_url)
+                else:
+                    append_to_file(UNIFIED, f"{current_time}|[{simplified_url}]|({title})|General|General\n")
+                    print(f"{current_time}|[{simplified_url}]|({title})|General|General")
+                    logging.info("Added URL: %s", simplified_url)
         else:
             log_error("URL Processing", simplified_url, f"Invalid URL with title: {title}")
             print("Invalid URL")
@@ -696,83 +1389,79 @@ def update_reference_entry(video_url: str, title: str, uploader: str, transcript
         transcript_file (str): The path to the transcript file.
     """
     updated = False
-    with open(UNIFIED, 'r') as file:
-        lines = file.readlines()
-
-    with open(UNIFIED, 'w') as file:
-        for line in lines:
-            if video_url in line:
-                if line.strip().endswith("|None"):
-                    line = line.replace("|None", f"|{transcript_file}")
-                elif not line.strip().endswith(f"|{transcript_file}"):
-                    line = line.rstrip() + f"|{transcript_file}\n"
-                updated = True
-            file.write(line)
-
-    if not updated:
-        append_to_file(UNIFIED, f"{datetime.now().strftime('%Y-%m-%dT%H:%M:%S')}|[{video_url}]|({title})|{uploader}|YouTube|{transcript_file}\n")
-
-    logging.info(f"Updated reference entry for URL: {video_url} with transcript file: {transcript_file}")
-    print(f"Updated reference entry for URL: {video_url} with transcript file: {transcript_file}")
+    with UNIFIED_LOCK:
+        # Only rewrite the file when there is an existing entry to update
+        if url_exists_in_file(video_url, UNIFIED):
+            with open(UNIFIED, 'r') as file:
+                lines = file.readlines()
+
+            changed = False
+            for i, line in enumerate(lines):
+                if video_url in line:
+                    if line.strip().endswith("|None"):
+                        lines[i] = line.replace("|None", f"|{transcript_file}")
+                        changed = True
+                    elif not line.strip().endswith(f"|{transcript_file}"):
+                        lines[i] = line.rstrip() + f"|{transcript_file}\n"
+                        changed = True
+                    updated = True
 
-def reference_has_transcript(url: str) -> bool:
-    """
-    Checks if a reference entry for a given URL has a transcript file referenced.
+            # Entries that already point at this transcript need no rewrite at all
+            if changed:
+                replace_file_lines(UNIFIED, lines)
 
-    Args:
-        url (str): The URL to check.
+        if not updated:
+            append_to_file(UNIFIED, f"{time.strftime(ENTRY_TIME_FORMAT)}|[{video_url}]|({title})|{uploader}|YouTube|{transcript_file}\n")
 
-    Returns:
-        bool: True if the reference entry has a transcript file referenced, False otherwise.
-    """
-    with open(UNIFIED, "r") as f:
-        for line in f:
-            if url in line:
-                parts = line.strip().split('|')
-                if len(parts) > 5 and parts[-1] != "None":
-                    return True
-    return False
+    logging.info("Updated reference entry for URL: %s with transcript file: %s", video_url, transcript_file)
+    print(f"Updated reference entry for URL: {video_url} with transcript file: {transcript_file}")
 
 def create_backup(file_path: str) -> None:
     """
-    Creates a backup of the specified file.
+    Creates a backup of the specified file. The copy is written to a temporary file and
+    renamed into place, so a backup that exists is always complete; it keeps the
+    original's permissions and timestamps.
     
     Args:
         file_path (str): The path to the file that needs to be backed up.
     """
-    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S")
-    backup_file_path = f"{os.path.dirname(file_path)}/{timestamp}_{os.path.basename(file_path)}"
+    timestamp = time.strftime("%Y%m%dT%H%M%S")
+    directory, file_name = os.path.split(file_path)
+    backup_file_path = os.path.join(directory, f"{timestamp}_{file_name}")
+    tmp_path = None
     try:
-        with open(file_path, 'r') as original_file:
-            with open(backup_file_path, 'w') as backup_file:
-                backup_file.write(original_file.read())
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{timestamp}_{file_name}.", suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(file_path, tmp_path)
+        shutil.copystat(file_path, tmp_path)
+        os.replace(tmp_path, backup_file_path)
+        tmp_path = None
         print(f"Backup created: {backup_file_path}")
-        logging.info(f"Backup created: {backup_file_path}")
+        logging.info("Backup created: %s", backup_file_path)
     except Exception as e:
         print(f"Error creating backup: {e}")
-        logging.error(f"Error creating backup: {e}")
+        logging.error("Error creating backup: %s", e)
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 def main():
     """Main function to handle the command-line interface for recording URLs."""
-    ensure_path_exists(UNIFIED)
     try:
         args = parse_arguments()
-
-        # Set logging level based on the debug argument
-        if args.debug == 1:
-            logging.getLogger().setLevel(logging.INFO)
-        elif args.debug == 2:
-            logging.getLogger().setLevel(logging.WARNING)
-        elif args.debug == 3:
-            logging.getLogger().setLevel(logging.DEBUG)
-        else:
-            logging.getLogger().setLevel(logging.ERROR)
+        configure_logging(args.debug)
+        ensure_path_exists(UNIFIED)
+        single_field_search = next(
+            ((getattr(args, option), field) for option, field in SINGLE_FIELD_SEARCHES.items() if getattr(args, option)),
+            None,
+        )
 
         if args.integrity:
             integrity_errors = check_integrity()
-            if integrity_errors:
+            first_error = next(integrity_errors, None)
+            if first_error is not None:
                 print("Integrity check failed:")
-                for error in integrity_errors:
+                for error in itertools.chain((first_error,), integrity_errors):
                     file_name, line_number, line_contents, expected_line = error
                     print(f"{file_name} line {line_number}: {line_contents}\nExpected: {expected_line}")
             else:
@@ -780,82 +1469,37 @@ def main():
         elif args.backup:
             create_backup(UNIFIED)
         elif args.search:
-            search_term = args.search
-            all_fields = ["url", "title", "date", "source", "uploader"]
-            results = {}
-            for field in all_fields:
-                field_results = search_entries(search_term, field, UNIFIED)
-                for line, hit_types in field_results.items():
-                    if line not in results:
-                        results[line] = hit_types
-                    else:
-                        results[line].extend(hit_types)
-            for line, hit_types in results.items():
-                unique_hit_types = list(set(hit_types))
-                print(line.strip())
-                for hit_type in unique_hit_types:
-                    print(f"-Hit Type: {hit_type}")
-        elif args.search_url:
-            results = search_entries(args.search_url, "url", UNIFIED)
-            for line, hit_types in results.items():
-                unique_hit_types = list(set(hit_types))
-                print(line.strip())
-                for hit_type in unique_hit_types:
-                    print(f"-Hit Type: {hit_type}")
-        elif args.search_title:
-            results = search_entries(args.search_title, "title", UNIFIED)
-            for line, hit_types in results.items():
-                unique_hit_types = list(set(hit_types))
-                print(line.strip())
-                for hit_type in unique_hit_types:
-                    print(f"-Hit Type: {hit_type}")
-        elif args.search_date:
-            results = search_entries(args.search_date, "date", UNIFIED)
-            for line, hit_types in results.items():
-                unique_hit_types = list(set(hit_types))
-                print(line.strip())
-                for hit_type in unique_hit_types:
-                    print(f"-Hit Type: {hit_type}")
-        elif args.search_source:
-            results = search_entries(args.search_source, "source", UNIFIED)
-            for line, hit_types in results.items():
-                unique_hit_types = list(set(hit_types))
-                print(line.strip())
-                for hit_type in unique_hit_types:
-                    print(f"-Hit Type: {hit_type}")
-        elif args.search_uploader:
-            results = search_entries(args.search_uploader, "uploader", UNIFIED)
-            for line, hit_types in results.items():
-                unique_hit_types = list(set(hit_types))
-                print(line.strip())
-                for hit_type in unique_hit_types:
-                    print(f"-Hit Type: {hit_type}")
+            print_search_results(search_entries_multi(args.search, ALL_SEARCH_FIELDS, UNIFIED))
+        elif single_field_search:
+            search_term, search_field = single_field_search
+            print_search_results(search_entries(search_term, search_field, UNIFIED))
         elif args.transcript and args.url:
             update_transcript(args.url)
         elif args.file:
-            read_urls_from_file(args.file, args.force)
+            read_urls_from_file(args.file, args.force, args.jobs)
         elif args.url:
             process_url(args.url, args.force)
         else:
-            timeout = None
             while True:
                 try:
-                    print("Enter a URL to record (or press Ctrl+C to quit): ")
-                    ready, _, _ = select.select([sys.stdin], [], [], timeout)
-                    if ready:
-                        url = sys.stdin.readline().strip()
-                        if url:  # Only process non-empty URLs
-                            force = False
-                            process_url(url, force)
-                        else:
-                            print("Empty URL. Please enter a valid URL.")
-                        time.sleep(1)  # Add a delay between processing each URL
-                    else:
+                    try:
+                        url = input("Enter a URL to record (or press Ctrl+C to quit): ").strip()
+                    except EOFError:
                         print("\nNo input received. Exiting...")
                         break
+                    if not url:
+                        print("Empty URL. Please enter a valid URL.")
+                        continue
+                    # Reject input that is not an http(s) URL before any network or API work
+                    parsed_url = urlsplit(url)
+                    if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+                        print(f"Invalid URL: {url}. Please enter an http or https URL.")
+                        continue
+                    force = False
+                    process_url(url, force)
                 except Exception as e:
                     print(f"An error occurred: {e}")
-                    logging.error(f"An error occurred: {e}")
+                    logging.error("An error occurred: %s", e)
     except KeyboardInterrupt:
         print("\nExiting...")
         sys.exit(0)
@@ -0,0 +1,220 @@
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ref_cli import cli
+
+
+class ExtractTitleTest(unittest.TestCase):
+    def test_undeclared_charset_is_decoded_as_utf8(self):
+        html = '<html><head><title>Café – naïve</title></head><body></body></html>'.encode()
+        self.assertEqual(cli.extract_title(html), 'Café – naïve')
+
+    def test_declared_charset_is_honoured(self):
+        html = ('<html><head><meta charset="iso-8859-1"><title>Café</title></head>'
+                '<body></body></html>').encode('iso-8859-1')
+        self.assertEqual(cli.extract_title(html), 'Café')
+
+    def test_h1_fallback_without_head_title(self):
+        html = '<html><head></head><body><h1>Über</h1></body></html>'.encode()
+        self.assertEqual(cli.extract_title(html), 'Über')
+
+
+class SimplifyUrlTest(unittest.TestCase):
+    def test_tracking_keys_are_removed(self):
+        url = 'https://example.com/a?id=1&utm_source=x&fbclid=y'
+        self.assertEqual(cli.simplify_url(url), 'https://example.com/a?id=1')
+
+    def test_kept_values_are_not_reencoded(self):
+        url = 'https://example.com/search?q=a b&path=/x/y'
+        self.assertEqual(cli.simplify_url(url), url)
+
+
+class AppendToFileTest(unittest.TestCase):
+    def test_file_removed_mid_run_is_recreated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'references.md')
+            cli.append_to_file(path, 'first\n')
+            os.remove(path)
+            cli.append_to_file(path, 'second\n')
+            with open(path) as f:
+                self.assertEqual(f.read(), 'second\n')
+
+
+class EnsurePathExistsTest(unittest.TestCase):
+    def test_missing_file_is_created(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sub', 'references.md')
+            cli.ensure_path_exists(path)
+            self.assertTrue(os.path.isfile(path))
+
+    def test_existing_file_keeps_its_mtime(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'references.md')
+            with open(path, 'w') as f:
+                f.write('entry\n')
+            os.utime(path, (1577836800, 1577836800))
+            cli.ensure_path_exists(path)
+            self.assertEqual(os.stat(path).st_mtime, 1577836800)
+
+
+class ReplaceFileLinesTest(unittest.TestCase):
+    def test_symlink_is_written_through(self):
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, 'synced', 'references.md')
+            os.makedirs(os.path.dirname(target))
+            with open(target, 'w') as f:
+                f.write('old\n')
+            link = os.path.join(directory, 'references.md')
+            os.symlink(target, link)
+            cli.replace_file_lines(link, ['new\n'])
+            self.assertTrue(os.path.islink(link))
+            with open(target) as f:
+                self.assertEqual(f.read(), 'new\n')
+
+
+def split_field_hits(line, needle, separator):
+    """The per-field search find_field_hits replaces: split the line and test each field."""
+    return {column for column, field in enumerate(line.split(separator)) if needle in field}
+
+
+class FindFieldHitsTest(unittest.TestCase):
+    def test_match_spanning_a_separator_does_not_count(self):
+        self.assertEqual(cli.find_field_hits(b'2024|[a]|(b)|c|General', b'a]|(b', b'|'), set())
+
+    def test_overlapping_matches_in_one_field(self):
+        self.assertEqual(cli.find_field_hits(b'ab|ababab|x', b'abab', b'|'), {1})
+
+    def test_match_in_several_fields(self):
+        self.assertEqual(cli.find_field_hits(b'aa|b|aaa|aa', b'aa', b'|'), {0, 2, 3})
+
+    def test_match_at_line_edges(self):
+        self.assertEqual(cli.find_field_hits('né|x|né', 'né', '|'), {0, 2})
+
+    def test_agrees_with_split_search(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            line = ''.join(rng.choice('ab|') for _ in range(rng.randint(0, 12)))
+            needle = ''.join(rng.choice('ab|') for _ in range(rng.randint(1, 3)))
+            for haystack, term, separator in ((line, needle, '|'), (line.encode(), needle.encode(), b'|')):
+                self.assertEqual(cli.find_field_hits(haystack, term, separator),
+                                 split_field_hits(haystack, term, separator), (line, needle))
+
+
+class SearchEntriesTest(unittest.TestCase):
+    LINES = [
+        '2024-01-02T03:04:05|[https://example.com/2024/cafe]|(Café Society)|Ünal|General\n',
+        '2023-05-06T07:08:09|[https://example.com/a]|(Naïve Bayes)|Bob|YouTube\n',
+        '2022-01-01T00:00:00|[https://example.com/b]|(Plain)|Carol|General\n',
+    ]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'references.md')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.writelines(self.LINES)
+
+    def test_single_field_reports_only_that_field(self):
+        results = cli.search_entries('cafe', 'title', self.path)
+        self.assertEqual(results, {})
+        results = cli.search_entries('cafe', 'url', self.path)
+        self.assertEqual(results, {self.LINES[0]: {'Url'}})
+
+    def test_search_reports_every_matching_field(self):
+        results = cli.search_entries_multi('2024', list(cli.ALL_SEARCH_FIELDS), self.path)
+        self.assertEqual(results, {self.LINES[0]: {'Date', 'Url'}})
+
+    def test_digit_only_term(self):
+        results = cli.search_entries('01', 'date', self.path)
+        self.assertEqual(set(results), {self.LINES[0], self.LINES[2]})
+        self.assertEqual(results[self.LINES[2]], {'Date'})
+
+    def test_non_ascii_term_is_case_insensitive(self):
+        self.assertEqual(cli.search_entries('CAFÉ', 'title', self.path), {self.LINES[0]: {'Title'}})
+        self.assertEqual(cli.search_entries('ünal', 'uploader', self.path), {self.LINES[0]: {'Uploader'}})
+        self.assertEqual(cli.search_entries('NAÏVE', 'url', self.path), {})
+
+    def test_ascii_term_is_case_insensitive(self):
+        self.assertEqual(cli.search_entries('YOUTUBE', 'source', self.path), {self.LINES[1]: {'Source'}})
+
+    def test_short_lines_are_skipped(self):
+        with open(self.path, 'a') as f:
+            f.write('not|a|reference\n')
+        with self.assertLogs(level='WARNING'):
+            results = cli.search_entries_multi('reference', list(cli.ALL_SEARCH_FIELDS), self.path)
+        self.assertEqual(results, {})
+
+
+class ReadUrlsFromFileTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'urls.txt')
+
+    def run_file(self, lines, process_url):
+        with open(self.path, 'w') as f:
+            f.writelines(lines)
+        with mock.patch.object(cli, 'process_url', side_effect=process_url), \
+                mock.patch('sys.stdout'):
+            cli.read_urls_from_file(self.path, jobs=4)
+        with open(self.path) as f:
+            return f.readlines()
+
+    def test_lines_are_commented_out_in_input_order(self):
+        # Earlier lines finish last, so results arrive out of order
+        delays = {f'https://host{i}.example/': (5 - i) * 0.02 for i in range(5)}
+        lines = ['# already done\n', '\n'] + [f'{url}\n' for url in delays]
+        result = self.run_file(lines, lambda url, force: time.sleep(delays[url]))
+        self.assertEqual(result, lines[:2] + [f'# {url}\n' for url in delays])
+
+    def test_duplicates_share_one_fetch(self):
+        calls = []
+        lock = threading.Lock()
+
+        def process_url(url, force):
+            with lock:
+                calls.append(url)
+
+        lines = [
+            'https://example.com/a?id=1\n',
+            'https://example.com/a?id=1&utm_source=feed\n',
+            'https://example.com/b\n',
+        ]
+        with self.assertLogs(level='DEBUG') as logs:
+            result = self.run_file(lines, process_url)
+        self.assertIn('Duplicate of line 1 on line 2: https://example.com/a?id=1&utm_source=feed',
+                      '\n'.join(logs.output))
+        self.assertEqual(sorted(calls), ['https://example.com/a?id=1', 'https://example.com/b'])
+        self.assertEqual(result, [f'# {line}' for line in lines])
+
+    def test_failed_lines_are_left_intact(self):
+        def process_url(url, force):
+            if 'bad' in url:
+                raise ValueError('boom')
+
+        lines = ['https://ok.example/1\n', 'https://bad.example/2\n', 'https://ok.example/3\n']
+        with self.assertLogs(level='ERROR'):
+            result = self.run_file(lines, process_url)
+        self.assertEqual(result, ['# https://ok.example/1\n', 'https://bad.example/2\n', '# https://ok.example/3\n'])
+
+    def test_same_host_does_not_block_other_hosts(self):
+        finished = {}
+
+        def process_url(url, force):
+            time.sleep(0.05)
+            finished[url] = time.monotonic()
+
+        lines = [f'https://slow.example/{i}\n' for i in range(8)] + ['https://other.example/\n']
+        start = time.monotonic()
+        self.run_file(lines, process_url)
+        self.assertLess(finished['https://other.example/'] - start, 0.2)
+        self.assertGreaterEqual(max(finished.values()) - start, 0.4)
+
+
+if __name__ == '__main__':
+    unittest.main()